@@ -22,7 +22,7 @@ from src.components.results import (
     render_api_calls_log
 )
 from src.core.fitting import FittingEngine
-from src.utils import t, get_supported_languages, get_current_language, set_language, get_language_flag
+from src.utils import t, get_supported_languages, get_current_language, set_language, sync_language, get_language_flag
 import plotly.graph_objects as go
 
 # 页面配置
@@ -32,8 +32,8 @@ default_config = load_default_config()
 if 'language' not in st.session_state:
     st.session_state.language = 'zh_CN'  # 默认中文
 
-# 初始化语言设置
-set_language(st.session_state.language)
+# 初始化语言设置（每次重新运行同步一次，之后的 t() 不再访问 session state）
+sync_language()
 
 st.set_page_config(
     page_title=t('app.title'),
@@ -282,7 +282,7 @@ def tab_canvas_fitting():
             render_progress_section(state)
             render_score_history(state['score_history'], key_suffix="_canvas")
             render_pareto_frontier(engine.get_pareto_frontier())
-            render_api_calls_log(state['api_calls_log'])
+            render_api_calls_log(state['api_calls_log'], totals=state)
 
 
 def tab_npz_fitting():
@@ -761,7 +761,7 @@ def tab_npz_fitting():
             render_progress_section(state)
             render_score_history(state['score_history'], key_suffix="_npz")
             render_pareto_frontier(engine.get_pareto_frontier())
-            render_api_calls_log(state['api_calls_log'])
+            render_api_calls_log(state['api_calls_log'], totals=state)
 
 
 def main():
@@ -7,15 +7,40 @@ import streamlit as st
 import yaml
 import json
 from pathlib import Path
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 from ..utils import t
 
 
-def load_default_config() -> Dict[str, Any]:
-    """加载默认配置"""
-    config_path = Path(__file__).parent.parent / "config" / "default.yaml"
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+# 优先使用 libyaml 的 C 实现加载器
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 默认配置缓存（进程内只解析一次）
+_DEFAULT_CONFIG = None
+
+
+def _freeze(value: Any) -> Any:
+    """递归地将 dict 转为只读的 MappingProxyType，list 转为 tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def load_default_config() -> Mapping[str, Any]:
+    """
+    加载默认配置
+    
+    返回的配置在进程内共享，因此被冻结为只读视图，
+    防止组件代码意外修改后影响后续的重新运行
+    """
+    global _DEFAULT_CONFIG
+    if _DEFAULT_CONFIG is None:
+        config_path = Path(__file__).parent.parent / "config" / "default.yaml"
+        with open(config_path, 'r', encoding='utf-8') as f:
+            _DEFAULT_CONFIG = _freeze(yaml.load(f, Loader=_YAML_LOADER))
+    return _DEFAULT_CONFIG
 
 
 def load_available_models(api_keys_path: str) -> List[str]:
@@ -280,4 +305,5 @@ def render_sidebar_config() -> Dict[str, Any]:
         'model_assess_average_order': default_config['ideasearch'].get('model_assess_average_order', 15.0),
         'model_assess_initial_score': default_config['ideasearch'].get('model_assess_initial_score', 20.0),
         'record_prompt_in_diary': default_config['ideasearch'].get('record_prompt_in_diary', True),
+        'epoch_workers': default_config['ideasearch'].get('epoch_workers', 1),
     }
@@ -3,12 +3,152 @@
 展示拟合结果、进度和调用记录
 """
 
+import hashlib
+import time
 import streamlit as st
+from collections import Counter
+from functools import lru_cache
 import plotly.graph_objects as go
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Any, Optional
-from ..utils import t
+import pyarrow as pa
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+from ..utils import t, get_current_language
+
+
+# API 调用状态标识
+_STATUS_SUCCESS = "✅"
+_STATUS_PENDING = "⏳"
+_STATUS_EXPLORING = "🔍"
+
+# API 调用统计所需字段（结构化数组，按列存储）
+_API_CALL_STATS_DTYPE = np.dtype([
+    ('model', object),
+    ('status', object),
+    ('score', np.float32),
+    ('cycle', np.int32),
+    ('total_api_calls', np.int32),
+])
+
+# 点数达到该阈值时改用 WebGL 渲染；点数较少时 WebGL 的初始化开销反而高于 SVG
+_WEBGL_MIN_POINTS = 500
+
+
+def _scatter_trace_cls(n_points: int) -> type:
+    """根据点数选择散点图 trace 类型（go.Scattergl 或 go.Scatter）"""
+    return go.Scattergl if n_points >= _WEBGL_MIN_POINTS else go.Scatter
+
+
+def _hash_ndarray(array: np.ndarray) -> Tuple[Tuple[int, ...], str, bytes]:
+    """按形状、类型和完整内容计算数组的缓存 key"""
+    contiguous = np.ascontiguousarray(array)
+    return array.shape, array.dtype.str, hashlib.blake2b(contiguous.view(np.uint8)).digest()
+
+
+def _downsample(x: np.ndarray, y: np.ndarray, max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按等间隔步长对绘图数据降采样（保留首尾点）
+    
+    仅用于渲染，误差指标等计算仍应使用完整数据
+    
+    Args:
+        x: x 数据数组
+        y: y 数据数组
+        max_points: 最多保留的点数
+    
+    Returns:
+        降采样后的 (x, y)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= max_points:
+        return x, y
+    idx = np.linspace(0, len(x) - 1, max_points).astype(np.int64)
+    return x[idx], y[idx]
+
+
+def _interp_extrapolate(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    线性插值，区间外按端点斜率线性外推
+    
+    与 scipy 的 interp1d(kind='linear', fill_value='extrapolate') 结果一致，
+    但无需导入 scipy
+    
+    Args:
+        x: 待求值的 x 数组
+        xp: 已知点的 x 数组（无序时会先排序）
+        fp: 已知点的 y 数组
+    
+    Returns:
+        插值结果数组
+    """
+    x = np.asarray(x, dtype=float)
+    xp = np.ascontiguousarray(xp, dtype=float)
+    fp = np.ascontiguousarray(fp, dtype=float)
+    
+    # np.interp 要求 xp 单调递增
+    if len(xp) >= 2 and np.any(xp[1:] < xp[:-1]):
+        order = np.argsort(xp, kind='stable')
+        xp = xp[order]
+        fp = fp[order]
+    
+    y = np.interp(x, xp, fp)
+    if len(xp) >= 2:
+        left = x < xp[0]
+        if left.any():
+            slope = (fp[1] - fp[0]) / (xp[1] - xp[0])
+            y[left] = fp[0] + (x[left] - xp[0]) * slope
+        right = x > xp[-1]
+        if right.any():
+            slope = (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+            y[right] = fp[-1] + (x[right] - xp[-1]) * slope
+    return y
+
+
+class _ProgressStats(NamedTuple):
+    """进度区域展示用的派生统计量"""
+    delta_score: Optional[float]
+    avg_calls: float
+    remaining_time: Optional[float]
+    progress: Optional[float]
+
+
+@lru_cache(maxsize=1)
+def _progress_stats(
+    current_cycle: int,
+    total_cycles: int,
+    total_api_calls: int,
+    elapsed_time: float,
+    last_scores: Tuple[float, ...]
+) -> _ProgressStats:
+    """
+    计算进度统计量（状态未变化时直接复用上次结果）
+    
+    Args:
+        current_cycle: 当前循环
+        total_cycles: 总循环数
+        total_api_calls: 累计 API 调用次数
+        elapsed_time: 已用时间
+        last_scores: 分数历史的最后两个值
+    
+    Returns:
+        进度统计量
+    """
+    started = current_cycle > 0
+    
+    # 分数变化趋势
+    delta_score = last_scores[-1] - last_scores[-2] if len(last_scores) >= 2 else None
+    
+    # 估算平均每循环的API调用数
+    avg_calls = total_api_calls / current_cycle if started else 0
+    
+    # 估算剩余时间
+    remaining_time = None
+    if started and total_cycles > current_cycle:
+        avg_time_per_cycle = elapsed_time / current_cycle
+        remaining_time = avg_time_per_cycle * (total_cycles - current_cycle)
+    
+    progress = current_cycle / total_cycles if total_cycles > 0 else None
+    return _ProgressStats(delta_score, avg_calls, remaining_time, progress)
 
 
 def render_progress_section(state: Dict[str, Any]) -> None:
@@ -20,52 +160,168 @@ def render_progress_section(state: Dict[str, Any]) -> None:
     """
     st.markdown(f"### {t('progress.title')}")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        current_cycle = state.get('current_cycle', 0)
-        total_cycles = state.get('total_cycles', 0)
-        st.metric(t('progress.current_cycle'), f"{current_cycle}/{total_cycles}")
-    
-    with col2:
-        best_score = state.get('best_score', 0.0)
-        # 显示分数变化趋势
-        score_history = state.get('score_history', [])
-        delta = None
-        if len(score_history) >= 2:
-            delta = score_history[-1] - score_history[-2]
-        st.metric(t('progress.best_score'), f"{best_score:.4f}", delta=f"{delta:.4f}" if delta is not None else None)
-    
-    with col3:
-        total_api_calls = state.get('total_api_calls', 0)
-        # 估算平均每循环的API调用数
-        avg_calls = total_api_calls / current_cycle if current_cycle > 0 else 0
-        st.metric(t('progress.api_calls'), f"{total_api_calls}", delta=t('progress.avg_per_cycle', avg=avg_calls) if avg_calls > 0 else None, delta_color="off")
-    
-    with col4:
-        elapsed_time = state.get('elapsed_time', 0.0)
-        # 估算剩余时间
-        if current_cycle > 0 and total_cycles > current_cycle:
-            avg_time_per_cycle = elapsed_time / current_cycle
-            remaining_time = avg_time_per_cycle * (total_cycles - current_cycle)
-            st.metric(t('progress.elapsed_time'), f"{elapsed_time:.1f}s", delta=t('progress.remaining_time', time=remaining_time), delta_color="off")
-        else:
-            st.metric(t('progress.elapsed_time'), f"{elapsed_time:.1f}s")
+    current_cycle = state.get('current_cycle', 0)
+    total_cycles = state.get('total_cycles', 0)
+    best_score = state.get('best_score', 0.0)
+    score_history = state.get('score_history', [])
+    total_api_calls = state.get('total_api_calls', 0)
+    elapsed_time = state.get('elapsed_time', 0.0)
+    
+    stats = _progress_stats(
+        current_cycle,
+        total_cycles,
+        total_api_calls,
+        elapsed_time,
+        tuple(score_history[-2:])
+    )
+    
+    # 显示分数变化趋势
+    score_delta = f"{stats.delta_score:.4f}" if stats.delta_score is not None else None
+    calls_delta = t('progress.avg_per_cycle', avg=stats.avg_calls) if stats.avg_calls > 0 else None
+    time_delta = None
+    if stats.remaining_time is not None:
+        time_delta = t('progress.remaining_time', time=stats.remaining_time)
+    
+    # (标签, 数值, 变化, 变化颜色)
+    metrics = [
+        (t('progress.current_cycle'), f"{current_cycle}/{total_cycles}", None, "normal"),
+        (t('progress.best_score'), f"{best_score:.4f}", score_delta, "normal"),
+        (t('progress.api_calls'), f"{total_api_calls}", calls_delta, "off"),
+        (t('progress.elapsed_time'), f"{elapsed_time:.1f}s", time_delta, "off"),
+    ]
+    for col, (label, value, delta, delta_color) in zip(st.columns(4), metrics):
+        col.metric(label, value, delta=delta, delta_color=delta_color)
     
     # 进度条（带百分比）
-    if total_cycles > 0:
-        progress = current_cycle / total_cycles
-        progress_text = t('progress.progress_text', progress=progress*100, current=current_cycle, total=total_cycles)
-        st.progress(progress, text=progress_text)
+    if stats.progress is not None:
+        progress_text = t('progress.progress_text', progress=stats.progress*100, current=current_cycle, total=total_cycles)
+        st.progress(stats.progress, text=progress_text)
+
+
+def _format_timestamp(timestamp: Any) -> str:
+    """格式化调用记录的时间戳（引擎以 time.time() 浮点数记录，展示时才转为字符串）"""
+    if isinstance(timestamp, float):
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+    return str(timestamp)
+
+
+def _build_api_calls_table(calls: List[Dict[str, Any]], first_sequence: int) -> pa.Table:
+    """
+    构建 API 调用记录表格
+    
+    Args:
+        calls: 需要展示的 API 调用记录
+        first_sequence: 第一条记录的序号
+    
+    Returns:
+        用于展示的 Arrow 表（列类型固定，便于增量拼接）
+    """
+    # 按列提取字段（每条记录每个字段只读取一次），再对整列做向量化处理
+    n_calls = len(calls)
+    expressions = np.array([str(call.get('expression', 'N/A')) for call in calls], dtype=object)
+    statuses = np.array([call.get('status', 'unknown') for call in calls], dtype=object)
+    scores = np.fromiter((call.get('score', 0.0) for call in calls), dtype=np.float64, count=n_calls)
+    cycles = [call.get('cycle', 'N/A') for call in calls]
+    models = [call.get('model', 'N/A') for call in calls]
+    call_counts = [call.get('total_api_calls') for call in calls]
+    timestamps = [_format_timestamp(call.get('timestamp', 'N/A')) for call in calls]
+    
+    # 对于过长的表达式，进行截断处理
+    lengths = np.fromiter(map(len, expressions), dtype=np.int64, count=n_calls)
+    too_long = lengths > 50
+    if too_long.any():
+        expressions[too_long] = [expr[:47] + '...' for expr in expressions[too_long]]
+    
+    # 根据状态选择状态标识（单独成列，只复制常量引用，无需逐行拼接字符串）
+    status_symbols = np.full(n_calls, _STATUS_EXPLORING, dtype=object)
+    status_symbols[(statuses == 'success') & (scores > 0)] = _STATUS_SUCCESS
+    status_symbols[statuses == 'no_expression'] = _STATUS_PENDING
+    
+    # 循环格式模板只翻译一次，逐行仅做格式化
+    cycle_format = t('api_calls.cycle_format')
+    
+    # 直接构建 Arrow 表交给 st.dataframe，省去 pandas 中间层及其到 Arrow 的转换
+    return pa.table({
+        t('api_calls.sequence'): pa.array(np.arange(first_sequence, first_sequence + n_calls, dtype=np.int64)),
+        t('api_calls.cycle'): pa.array([cycle_format.format(cycle=cycle) for cycle in cycles], type=pa.string()),
+        t('api_calls.model'): pa.array([str(model) for model in models], type=pa.string()),
+        t('api_calls.status'): pa.array(status_symbols, type=pa.string()),
+        t('api_calls.expression'): pa.array(expressions, type=pa.string()),
+        t('api_calls.fitting_score'): pa.array([f"{score:.4f}" for score in scores], type=pa.string()),
+        t('api_calls.call_count'): pa.array(
+            [count if isinstance(count, (int, np.integer)) else None for count in call_counts],
+            type=pa.int64()
+        ),
+        t('api_calls.timestamp'): pa.array(timestamps, type=pa.string())
+    })
+
+
+def _api_call_stats_fields(calls: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    一次遍历提取统计所需的字段
+    
+    Args:
+        calls: API 调用记录列表
+    
+    Returns:
+        按列访问的结构化数组
+    """
+    return np.array(
+        [
+            (
+                call.get('model', 'Unknown'),
+                call.get('status', 'unknown'),
+                call.get('score', 0.0),
+                call.get('cycle', 0),
+                call.get('total_api_calls', 0)
+            )
+            for call in calls
+        ],
+        dtype=_API_CALL_STATS_DTYPE
+    )
+
+
+def _api_call_totals_from_fields(fields: np.ndarray) -> Dict[str, Any]:
+    """
+    由当前记录窗口的统计字段构造与引擎累计统计相同结构的汇总
+    
+    Args:
+        fields: _api_call_stats_fields 返回的结构化数组
+    
+    Returns:
+        汇总字典（键同 FittingEngine.get_state() 中的累计统计）
+    """
+    scores = fields['score']
+    last_api_call = None
+    if fields.size:
+        last_api_call = {'total_api_calls': int(fields['total_api_calls'][-1]), 'cycle': int(fields['cycle'][-1])}
+    return {
+        'api_call_counts': Counter(fields['model']),
+        'api_status_counts': Counter(fields['status']),
+        'api_score_stats': {
+            'count': scores.size,
+            'sum': float(scores.sum()),
+            'min': float(scores.min()) if scores.size else 0.0,
+            'max': float(scores.max()) if scores.size else 0.0,
+            'valid': int(np.count_nonzero(scores > 0)),
+        },
+        'last_api_call': last_api_call,
+    }
 
 
-def render_api_calls_log(api_calls: List[Dict[str, Any]], max_display: int = 50) -> None:
+def render_api_calls_log(
+    api_calls: List[Dict[str, Any]],
+    max_display: int = 50,
+    totals: Optional[Dict[str, Any]] = None
+) -> None:
     """
     渲染 API 调用记录
     
     Args:
-        api_calls: API 调用记录列表
+        api_calls: API 调用记录列表（引擎只保留最近的记录）
         max_display: 最大显示记录数
+        totals: 引擎的累计统计（即 get_state() 返回的状态字典），
+            提供时统计信息覆盖全部调用，否则只统计 api_calls 中的记录
     """
     st.markdown(f"### {t('api_calls.title')}")
     
@@ -73,40 +329,54 @@ def render_api_calls_log(api_calls: List[Dict[str, Any]], max_display: int = 50)
         st.info(t('api_calls.no_records'))
         return
     
-    # 显示最新的记录
-    display_calls = api_calls[-max_display:]
-    
-    # 创建表格数据
-    records = []
-    for i, call in enumerate(display_calls, 1):
-        # 根据状态设置不同的显示风格
-        status = call.get('status', 'unknown')
-        expression_display = call.get('expression', 'N/A')
-        
-        # 对于过长的表达式，进行截断处理
-        if len(expression_display) > 50:
-            expression_display = expression_display[:47] + '...'
-        
-        # 根据状态添加状态标识
-        if status == 'no_expression':
-            expression_display = "⏳ " + expression_display
-        elif status == 'success' and call.get('score', 0) > 0:
-            expression_display = "✅ " + expression_display
+    # 与上次渲染时缓存的记录比较，只为新增的调用构建表格行并提取统计字段
+    n_calls = len(api_calls)
+    language = get_current_language()
+    cache = st.session_state.get('api_log_cache')
+    new_start = None
+    if (
+        cache is not None
+        and cache['language'] == language
+        and cache['max_display'] == max_display
+    ):
+        # 引擎的日志是有界队列，写满后长度不再增长，因此从末尾向前按对象身份
+        # 查找上次渲染的最后一条记录，其后的都是新增记录
+        last_call = cache['last_call']
+        for i in range(n_calls - 1, -1, -1):
+            if api_calls[i] is last_call:
+                new_start = i + 1
+                break
+    if new_start is None:
+        cache = {
+            'language': language,
+            'max_display': max_display,
+            'seen': 0,
+            'last_call': None,
+            'table': None,
+            'fields': _api_call_stats_fields([]),
+        }
+        new_start = 0
+    new_calls = api_calls[new_start:]
+    
+    if new_calls:
+        # 只显示最新的记录（序号按已处理的记录数连续递增）
+        display_calls = new_calls[-max_display:]
+        first_sequence = cache['seen'] + len(new_calls) - len(display_calls) + 1
+        new_table = _build_api_calls_table(display_calls, first_sequence)
+        if cache['table'] is None or len(display_calls) == max_display:
+            cache['table'] = new_table
         else:
-            expression_display = "🔍 " + expression_display
-        
-        records.append({
-            t('api_calls.sequence'): len(api_calls) - max_display + i if len(api_calls) > max_display else i,
-            t('api_calls.cycle'): t('api_calls.cycle_format', cycle=call.get('cycle', 'N/A')),
-            t('api_calls.model'): call.get('model', 'N/A'),
-            t('api_calls.expression_status'): expression_display,
-            t('api_calls.fitting_score'): f"{call.get('score', 0.0):.4f}",
-            t('api_calls.call_count'): call.get('total_api_calls', 'N/A'),
-            t('api_calls.timestamp'): call.get('timestamp', 'N/A')
-        })
-    
-    df = pd.DataFrame(records)
-    st.dataframe(df, use_container_width=True, height=300)
+            table = pa.concat_tables([cache['table'], new_table])
+            cache['table'] = table.slice(max(0, table.num_rows - max_display))
+        # 新增记录只遍历一次；统计字段只保留与当前记录窗口对应的部分
+        new_fields = _api_call_stats_fields(new_calls)
+        cache['fields'] = np.concatenate([cache['fields'], new_fields])[-n_calls:]
+        cache['seen'] += len(new_calls)
+        cache['last_call'] = api_calls[-1]
+        st.session_state['api_log_cache'] = cache
+    
+    # 传入未经 .style 处理的原始数据（带样式的 DataFrame 渲染很慢）
+    st.dataframe(cache['table'], use_container_width=True, height=300, hide_index=True)
     
     # 状态说明
     with st.expander(t('api_calls.status_legend')):
@@ -121,61 +391,126 @@ def render_api_calls_log(api_calls: List[Dict[str, Any]], max_display: int = 50)
             st.write(t('api_calls.status_exploring'))
             st.write(t('api_calls.status_exploring_desc'))
     
-    # 统计信息
-    with st.expander(t('api_calls.call_statistics')):
-        col1, col2 = st.columns(2)
-        with col1:
-            st.write(t('api_calls.model_usage'))
-            model_counts = {}
-            for call in api_calls:
-                model = call.get('model', 'Unknown')
-                model_counts[model] = model_counts.get(model, 0) + 1
-            for model, count in sorted(model_counts.items(), key=lambda x: x[1], reverse=True):
-                st.write(f"- {model}: {count} 次")
-            
-            # 状态统计
-            st.write(t('api_calls.task_status'))
-            status_counts = {}
-            for call in api_calls:
-                status = call.get('status', 'unknown')
-                status_counts[status] = status_counts.get(status, 0) + 1
+    # 统计信息（默认不计算，勾选后才展开并统计，避免每次重新运行都遍历全部记录）
+    if st.checkbox(t('api_calls.show_statistics'), value=False, key="show_api_call_stats"):
+        with st.expander(t('api_calls.call_statistics'), expanded=True):
+            if totals is None or totals.get('api_score_stats') is None:
+                totals = _api_call_totals_from_fields(cache['fields'])
             
-            status_labels = {
-                'success': t('api_calls.status_success_count'),
-                'no_expression': t('api_calls.status_searching_count'),
-                'unknown': t('api_calls.status_exploring_count')
-            }
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(t('api_calls.model_usage'))
+                for model, count in Counter(totals['api_call_counts']).most_common():
+                    st.write(f"- {model}: {count} 次")
+                
+                # 状态统计
+                st.write(t('api_calls.task_status'))
+                status_labels = {
+                    'success': t('api_calls.status_success_count'),
+                    'no_expression': t('api_calls.status_searching_count'),
+                    'unknown': t('api_calls.status_exploring_count')
+                }
+                
+                for status, count in totals['api_status_counts'].items():
+                    label = status_labels.get(status, t('api_calls.unknown_status', status=status))
+                    st.write(f"- {label}: {count} 次")
             
-            for status, count in status_counts.items():
-                label = status_labels.get(status, t('api_calls.unknown_status', status=status))
-                st.write(f"- {label}: {count} 次")
+            with col2:
+                st.write(t('api_calls.score_distribution'))
+                score_stats = totals['api_score_stats']
+                score_count = score_stats['count']
+                if score_count:
+                    valid_count = score_stats['valid']
+                    if valid_count:
+                        st.write(f"- {t('api_calls.avg_score', score=score_stats['sum'] / score_count)}")
+                        st.write(f"- {t('api_calls.max_score', score=score_stats['max'])}")
+                        st.write(f"- {t('api_calls.min_score', score=score_stats['min'])}")
+                        st.write(f"- {t('api_calls.valid_scores', valid=valid_count, total=score_count)}")
+                    else:
+                        st.write(f"- {t('api_calls.no_valid_scores')}")
+                        st.write(f"- {t('api_calls.total_records', count=score_count)}")
+                
+                # API调用效率（基于最新一条记录）
+                st.write(t('api_calls.api_efficiency'))
+                last_call = totals['last_api_call']
+                if last_call is not None:
+                    total_calls = int(last_call.get('total_api_calls', 0))
+                    cycles = int(last_call.get('cycle', 0))
+                    if cycles > 0 and total_calls > 0:
+                        avg_calls_per_cycle = total_calls / cycles
+                        st.write(f"- {t('api_calls.total_api_calls', count=total_calls)}")
+                        st.write(f"- {t('api_calls.avg_calls_per_cycle', avg=avg_calls_per_cycle)}")
+                    else:
+                        st.write(f"- {t('api_calls.calculating')}")
+
+
+@st.cache_data(max_entries=8, hash_funcs={np.ndarray: _hash_ndarray})
+def _build_comparison_fig(
+    original_x: np.ndarray,
+    original_y: np.ndarray,
+    fitted_x: Optional[np.ndarray],
+    fitted_y: Optional[np.ndarray],
+    labels: Dict[str, str]
+) -> go.Figure:
+    """
+    构建原始曲线与拟合结果对比图（按数组内容缓存）
+    
+    Args:
+        original_x: 原始 x 数据
+        original_y: 原始 y 数据
+        fitted_x: 拟合 x 数据
+        fitted_y: 拟合 y 数据
+        labels: 图表中使用的翻译文本
+    
+    Returns:
+        Plotly 图表对象
+    """
+    # 绘图数据降采样，完整数据保留用于误差计算
+    # 以 float32 传给 Plotly，减半序列化和传输的数据量
+    plot_x, plot_y = _downsample(original_x, original_y)
+    plot_x = plot_x.astype(np.float32, copy=False)
+    plot_y = plot_y.astype(np.float32, copy=False)
+    
+    has_fitted = fitted_x is not None and fitted_y is not None
+    if has_fitted:
+        plot_fitted_x, plot_fitted_y = _downsample(fitted_x, fitted_y)
+        plot_fitted_x = plot_fitted_x.astype(np.float32, copy=False)
+        plot_fitted_y = plot_fitted_y.astype(np.float32, copy=False)
+    
+    # 创建图表
+    fig = go.Figure()
+    
+    # 批量添加 trace 和更新布局，避免逐次触发属性变更通知
+    with fig.batch_update():
+        # 添加原始曲线
+        fig.add_trace(_scatter_trace_cls(len(plot_x))(
+            x=plot_x,
+            y=plot_y,
+            mode='markers',
+            name=labels['original_data'],
+            marker=dict(size=8, color='#1f77b4', opacity=0.6)
+        ))
         
-        with col2:
-            st.write(t('api_calls.score_distribution'))
-            scores = [call.get('score', 0) for call in api_calls]
-            if scores:
-                valid_scores = [s for s in scores if s > 0]
-                if valid_scores:
-                    st.write(f"- {t('api_calls.avg_score', score=np.mean(scores))}")
-                    st.write(f"- {t('api_calls.max_score', score=np.max(scores))}")
-                    st.write(f"- {t('api_calls.min_score', score=np.min(scores))}")
-                    st.write(f"- {t('api_calls.valid_scores', valid=len(valid_scores), total=len(scores))}")
-                else:
-                    st.write(f"- {t('api_calls.no_valid_scores')}")
-                    st.write(f"- {t('api_calls.total_records', count=len(scores))}")
-            
-            # API调用效率
-            st.write(t('api_calls.api_efficiency'))
-            if api_calls:
-                latest_call = api_calls[-1]
-                total_calls = latest_call.get('total_api_calls', 0)
-                cycles = latest_call.get('cycle', 0)
-                if cycles > 0 and total_calls > 0:
-                    avg_calls_per_cycle = total_calls / cycles
-                    st.write(f"- {t('api_calls.total_api_calls', count=total_calls)}")
-                    st.write(f"- {t('api_calls.avg_calls_per_cycle', avg=avg_calls_per_cycle)}")
-                else:
-                    st.write(f"- {t('api_calls.calculating')}")
+        # 添加拟合曲线
+        if has_fitted:
+            fig.add_trace(_scatter_trace_cls(len(plot_fitted_x))(
+                x=plot_fitted_x,
+                y=plot_fitted_y,
+                mode='lines',
+                name=labels['fitted_result'],
+                line=dict(color='#ff7f0e', width=3)
+            ))
+        
+        # 更新布局
+        fig.update_layout(
+            title=labels['chart_title'],
+            xaxis_title=labels['x_axis'],
+            yaxis_title=labels['y_axis'],
+            hovermode='x unified',
+            template='plotly_white',
+            height=500
+        )
+    return fig
 
 
 def render_fitting_comparison(
@@ -197,37 +532,14 @@ def render_fitting_comparison(
     """
     st.markdown(f"### {t('results.comparison_title')}")
     
-    # 创建图表
-    fig = go.Figure()
-    
-    # 添加原始曲线
-    fig.add_trace(go.Scatter(
-        x=original_x,
-        y=original_y,
-        mode='markers',
-        name=t('results.original_data'),
-        marker=dict(size=8, color='#1f77b4', opacity=0.6)
-    ))
-    
-    # 添加拟合曲线
-    if fitted_x is not None and fitted_y is not None:
-        fig.add_trace(go.Scatter(
-            x=fitted_x,
-            y=fitted_y,
-            mode='lines',
-            name=t('results.fitted_result'),
-            line=dict(color='#ff7f0e', width=3)
-        ))
-    
-    # 更新布局
-    fig.update_layout(
-        title=t('results.comparison_chart_title'),
-        xaxis_title=t('results.x_axis'),
-        yaxis_title=t('results.y_axis'),
-        hovermode='x unified',
-        template='plotly_white',
-        height=500
-    )
+    labels = {
+        'original_data': t('results.original_data'),
+        'fitted_result': t('results.fitted_result'),
+        'chart_title': t('results.comparison_chart_title'),
+        'x_axis': t('results.x_axis'),
+        'y_axis': t('results.y_axis'),
+    }
+    fig = _build_comparison_fig(original_x, original_y, fitted_x, fitted_y, labels)
     
     st.plotly_chart(fig, use_container_width=True, key="fitting_comparison_chart")
     
@@ -239,13 +551,13 @@ def render_fitting_comparison(
         # 计算拟合误差
         if fitted_x is not None and fitted_y is not None:
             # 在原始数据点上插值拟合结果
-            from scipy import interpolate
-            f = interpolate.interp1d(fitted_x, fitted_y, kind='linear', fill_value='extrapolate')
-            fitted_at_original = f(original_x)
+            fitted_at_original = _interp_extrapolate(original_x, fitted_x, fitted_y)
             
-            mse = np.mean((original_y - fitted_at_original) ** 2)
+            # 残差只计算一次，三个指标都由它得到
+            resid = np.asarray(original_y, dtype=float) - fitted_at_original
+            mse = np.dot(resid, resid) / resid.size
             rmse = np.sqrt(mse)
-            mae = np.mean(np.abs(original_y - fitted_at_original))
+            mae = np.abs(resid, out=resid).mean()
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -256,6 +568,54 @@ def render_fitting_comparison(
                 st.metric(t('results.mae'), f"{mae:.4f}")
 
 
+@st.cache_data(max_entries=8)
+def _build_pareto_fig(points: Tuple[Tuple[int, float, str], ...], labels: Dict[str, str]) -> go.Figure:
+    """
+    构建 Pareto 前沿图（按前沿数据内容缓存）
+    
+    Args:
+        points: (复杂度, 分数, 表达式) 元组序列
+        labels: 图表中使用的翻译文本
+    
+    Returns:
+        Plotly 图表对象
+    """
+    # 按列提取为定长数值数组，颜色映射直接复用分数数组，避免 Plotly 逐元素类型检查
+    n_points = len(points)
+    complexities = np.fromiter((point[0] for point in points), dtype=np.int32, count=n_points)
+    scores = np.fromiter((point[1] for point in points), dtype=np.float32, count=n_points)
+    expressions = np.array([str(point[2]) for point in points], dtype=object)
+    
+    # 过长的表达式只在悬停文本中截断显示（astype('U30') 在 C 层完成截断）
+    lengths = np.fromiter(map(len, expressions), dtype=np.int64, count=n_points)
+    too_long = lengths > 30
+    if too_long.any():
+        truncated = np.char.add(expressions.astype('U30'), '...').astype(object)
+        expressions = np.where(too_long, truncated, expressions)
+    
+    # 创建散点图
+    fig = go.Figure()
+    
+    with fig.batch_update():
+        fig.add_trace(_scatter_trace_cls(n_points)(
+            x=complexities,
+            y=scores,
+            mode='markers+lines',
+            marker=dict(size=10, color=scores, colorscale='Viridis', showscale=True),
+            text=expressions,
+            hovertemplate='<b>复杂度:</b> %{x}<br><b>分数:</b> %{y:.2f}<br><b>表达式:</b> %{text}<extra></extra>'
+        ))
+        
+        fig.update_layout(
+            title=labels['chart_title'],
+            xaxis_title=labels['complexity'],
+            yaxis_title=labels['score'],
+            template='plotly_white',
+            height=400
+        )
+    return fig
+
+
 def render_pareto_frontier(pareto_data: Dict[int, Dict]) -> None:
     """
     渲染 Pareto 前沿图
@@ -269,51 +629,36 @@ def render_pareto_frontier(pareto_data: Dict[int, Dict]) -> None:
         st.info(t('pareto.no_data'))
         return
     
-    # 提取数据
-    complexities = []
-    scores = []
-    expressions = []
-    
-    for complexity, info in pareto_data.items():
-        complexities.append(complexity)
-        scores.append(info.get('score', 0))
-        expr = info.get('ansatz', 'N/A')
-        expressions.append(expr[:30] + '...' if len(expr) > 30 else expr)
-    
-    # 创建散点图
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=complexities,
-        y=scores,
-        mode='markers+lines',
-        marker=dict(size=10, color=scores, colorscale='Viridis', showscale=True),
-        text=expressions,
-        hovertemplate='<b>复杂度:</b> %{x}<br><b>分数:</b> %{y:.2f}<br><b>表达式:</b> %{text}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=t('pareto.chart_title'),
-        xaxis_title=t('pareto.complexity'),
-        yaxis_title=t('pareto.score'),
-        template='plotly_white',
-        height=400
+    labels = {
+        'chart_title': t('pareto.chart_title'),
+        'complexity': t('pareto.complexity'),
+        'score': t('pareto.score'),
+    }
+    # 只用绘图需要的字段作为缓存 key
+    points = tuple(
+        (complexity, info.get('score', 0), info.get('ansatz', 'N/A'))
+        for complexity, info in pareto_data.items()
     )
+    fig = _build_pareto_fig(points, labels)
     
     st.plotly_chart(fig, use_container_width=True, key="pareto_frontier_chart")
     
     # 显示详细表格
     with st.expander(t('pareto.detail_data')):
-        records = []
-        for complexity, info in sorted(pareto_data.items()):
-            records.append({
-                t('pareto.complexity_col'): complexity,
-                t('pareto.score_col'): f"{info.get('score', 0):.2f}",
-                t('pareto.expression_col'): info.get('ansatz', 'N/A'),
-                t('pareto.created_time'): info.get('created_at', 'N/A')
-            })
-        df = pd.DataFrame(records)
-        st.dataframe(df, use_container_width=True)
+        # 列名只翻译一次
+        complexity_col = t('pareto.complexity_col')
+        score_col = t('pareto.score_col')
+        expression_col = t('pareto.expression_col')
+        created_time_col = t('pareto.created_time')
+        
+        rows = sorted(pareto_data.items())
+        table = pa.table({
+            complexity_col: pa.array([complexity for complexity, _ in rows], type=pa.int64()),
+            score_col: pa.array([f"{info.get('score', 0):.2f}" for _, info in rows], type=pa.string()),
+            expression_col: pa.array([str(info.get('ansatz', 'N/A')) for _, info in rows], type=pa.string()),
+            created_time_col: pa.array([str(info.get('created_at', 'N/A')) for _, info in rows], type=pa.string())
+        })
+        st.dataframe(table, use_container_width=True, hide_index=True)
 
 
 def render_score_history(score_history: List[float], key_suffix: str = "") -> None:
@@ -337,25 +682,42 @@ def render_score_history(score_history: List[float], key_suffix: str = "") -> No
         st.info(t('score_history.no_history'))
         return
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=list(range(1, len(score_history) + 1)),
-        y=score_history,
-        mode='lines+markers',
-        name=t('score_history.best_score'),
-        line=dict(color='#2ca02c', width=2),
-        marker=dict(size=6)
-    ))
-    
-    fig.update_layout(
-        title=t('score_history.chart_title'),
-        xaxis_title=t('score_history.cycle_axis'),
-        yaxis_title=t('score_history.score_axis'),
-        template='plotly_white',
-        height=300
-    )
-    
     # 使用唯一的 key
     chart_key = f"score_history_chart{key_suffix}" if key_suffix else "score_history_chart"
+    
+    # 复用会话中已构建的图表，只更新曲线数据，避免每次轮询都重建图表和布局
+    # 图表中包含翻译文本，因此缓存 key 需要区分语言
+    fig_key = f"{chart_key}_fig_{get_current_language()}"
+    x_values = np.arange(1, len(score_history) + 1, dtype=np.int32)
+    y_values = np.asarray(score_history, dtype=np.float32)
+    trace_cls = _scatter_trace_cls(len(x_values))
+    fig = st.session_state.get(fig_key)
+    
+    if fig is None or not isinstance(fig.data[0], trace_cls):
+        fig = go.Figure()
+        
+        with fig.batch_update():
+            fig.add_trace(trace_cls(
+                x=x_values,
+                y=y_values,
+                mode='lines+markers',
+                name=t('score_history.best_score'),
+                line=dict(color='#2ca02c', width=2),
+                marker=dict(size=6)
+            ))
+            
+            fig.update_layout(
+                title=t('score_history.chart_title'),
+                xaxis_title=t('score_history.cycle_axis'),
+                yaxis_title=t('score_history.score_axis'),
+                template='plotly_white',
+                height=300
+            )
+        st.session_state[fig_key] = fig
+    elif not np.array_equal(fig.data[0].y, y_values):
+        # 仅在分数历史变化时更新数据，无关控件触发的重新运行直接复用图表
+        with fig.batch_update():
+            fig.data[0].x = x_values
+            fig.data[0].y = y_values
+    
     st.plotly_chart(fig, use_container_width=True, key=chart_key)
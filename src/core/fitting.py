@@ -5,22 +5,197 @@
 
 import os
 import sys
+import ast
 import re
 import time
 import base64
+import queue
+import threading
 import numpy as np
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Counter as CounterType, Deque, Tuple
 from datetime import datetime
 
 from IdeaSearch import IdeaSearcher
 from IdeaSearch_fit import IdeaSearchFitter
 
 
-def print_flush(*args, **kwargs):
-    """打印并立即刷新输出到控制台"""
-    print(*args, **kwargs)
-    sys.stdout.flush()
+# diary 中表示一次 API 调用成功的匹配模式（模块加载时编译一次）；
+# 以行首锚定，每个包含调用成功标记的行恰好产生一次匹配
+_API_CALL_RE = re.compile(r'^.*?(?:get_answer.*?调用成功|API调用成功|模型响应成功)', re.IGNORECASE | re.MULTILINE)
+
+
+# 进度帧环形缓冲区容量（仅保留最近的帧）
+_FRAME_CAPACITY = 2000
+
+# evaluate_expression 变量字典缓存的最大数组数
+_EVAL_CACHE_SIZE = 4
+
+# 延迟导入的 numexpr 模块（首次使用时设置线程数）
+_NUMEXPR = None
+
+
+def _get_numexpr():
+    """延迟导入 numexpr，并在首次导入时设置一次线程数"""
+    global _NUMEXPR
+    if _NUMEXPR is None:
+        import numexpr
+        numexpr.set_num_threads(min(8, os.cpu_count() or 1))
+        _NUMEXPR = numexpr
+    return _NUMEXPR
+
+
+# 延迟导入的 numba.njit（可选依赖，见 pyproject 的 jit extra）；
+# False 表示尚未尝试导入，None 表示未安装，只尝试导入一次
+_NJIT: Any = False
+
+
+def _get_njit() -> Optional[Callable]:
+    """延迟导入 numba.njit，未安装时返回 None"""
+    global _NJIT
+    if _NJIT is False:
+        try:
+            from numba import njit
+        except ImportError:
+            njit = None
+        _NJIT = njit
+    return _NJIT
+
+
+# 表达式白名单允许的运算符
+_SAFE_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_SAFE_UNARYOPS = (ast.UAdd, ast.USub)
+
+
+def _is_safe_expression(expr_str: str, names: Tuple[str, ...], functions: Tuple[str, ...]) -> bool:
+    """
+    检查表达式是否只包含白名单内的语法（sympify 内部使用 eval，表达式来自模型输出）
+    
+    仅允许数值常量、四则与幂运算、正负号、指定的变量/常量名，以及对指定函数的位置参数调用；
+    属性访问、下标、字符串、关键字参数等一律拒绝
+    
+    Args:
+        expr_str: 数学表达式
+        names: 允许出现的变量名与常量名
+        functions: 允许调用的函数名
+    
+    Returns:
+        是否安全
+    """
+    try:
+        tree = ast.parse(expr_str, mode='eval')
+    except (SyntaxError, ValueError):
+        return False
+    
+    def check(node: ast.AST) -> bool:
+        if isinstance(node, ast.BinOp):
+            return isinstance(node.op, _SAFE_BINOPS) and check(node.left) and check(node.right)
+        if isinstance(node, ast.UnaryOp):
+            return isinstance(node.op, _SAFE_UNARYOPS) and check(node.operand)
+        if isinstance(node, ast.Constant):
+            return type(node.value) in (int, float)
+        if isinstance(node, ast.Name):
+            return node.id in names
+        if isinstance(node, ast.Call):
+            return (
+                isinstance(node.func, ast.Name)
+                and node.func.id in functions
+                and not node.keywords
+                and all(check(arg) for arg in node.args)
+            )
+        return False
+    
+    return check(tree.body)
+
+
+@lru_cache(maxsize=256)
+def _compile_expr(
+    expr_str: str,
+    nvars: int,
+    constants: Tuple[Tuple[str, float], ...],
+    functions: Tuple[str, ...]
+) -> Callable:
+    """
+    将 numexpr 无法处理的表达式编译为原生函数（numexpr 失败时的后备路径）
+    
+    先做语法白名单检查，再用 sympy 解析并 lambdify 为 numpy 函数，若安装了可选的 numba 则进一步 njit 编译。
+    同一表达式在各 epoch 间会反复出现，因此按参数缓存编译结果。
+    
+    Args:
+        expr_str: 数学表达式
+        nvars: 变量个数（x1..xn）
+        constants: 常量 (名称, 值) 元组
+        functions: 允许调用的函数名
+    
+    Returns:
+        接收 nvars 个一维数组的可调用对象
+    
+    Raises:
+        ValueError: 表达式包含白名单以外的语法
+    """
+    var_names = tuple(f'x{i+1}' for i in range(nvars))
+    if not _is_safe_expression(expr_str, var_names + tuple(name for name, _ in constants), functions):
+        raise ValueError(f"表达式包含不允许的语法: {expr_str}")
+    
+    import sympy
+    
+    syms = sympy.symbols(var_names)
+    # numpy 风格的函数名映射到 sympy
+    names = {
+        'arcsin': sympy.asin,
+        'arccos': sympy.acos,
+        'arctan': sympy.atan,
+        'square': lambda a: a ** 2,
+        'log10': lambda a: sympy.log(a, 10),
+        'abs': sympy.Abs,
+    }
+    names.update(zip((str(s) for s in syms), syms))
+    names.update((name, sympy.Float(value)) for name, value in constants)
+    
+    func = sympy.lambdify(syms, sympy.sympify(expr_str, locals=names), 'numpy')
+    
+    njit = _get_njit()
+    if njit is None:
+        return func
+    
+    # lambdify 生成的函数没有源文件，无法使用 cache=True 持久化；
+    # 候选表达式常产生 NaN/Inf（负数取对数、开方、除零），因此不启用 fastmath
+    jitted = njit(func)
+    try:
+        # 用小数组预热一次，编译失败时退回到纯 numpy 函数
+        with np.errstate(all='ignore'):
+            jitted(*(np.linspace(0.5, 1.5, 4) for _ in range(nvars)))
+    except Exception:
+        return func
+    return jitted
+
+
+@lru_cache(maxsize=4)
+def _decode_canvas(canvas_image: str) -> bytes:
+    """解码 base64 画布图片（画布未变时重试拟合可直接复用上次的解码结果）"""
+    return base64.b64decode(canvas_image)
+
+
+def _format_ts(ts: float) -> str:
+    """将 time.time() 时间戳格式化为本地时间字符串"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))
+
+
+def _keep_idea(idea):
+    """filter_func：保留想法"""
+    return idea
+
+
+def _clear_idea(idea):
+    """filter_func：清空想法（强制生成新的）"""
+    return ""
+
+
+# 打印并立即刷新输出到控制台
+print_flush = partial(print, flush=True)
 
 
 class FittingEngine:
@@ -46,6 +221,9 @@ class FittingEngine:
         self.ideasearcher: Optional[IdeaSearcher] = None
         self.result_path: Optional[str] = None
         self.database_path: Optional[str] = None
+        # 本次拟合的目录标签（日志目录与数据库目录共用同一时间戳）；
+        # run_fitting 每次运行时刷新，直接调用初始化方法时使用创建引擎时的时间
+        self._run_tag = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # 状态跟踪
         self.is_running = False
@@ -56,12 +234,48 @@ class FittingEngine:
         self.best_expression = ""
         self.total_api_calls = 0
         self.start_time = 0.0
-        self.api_calls_log: List[Dict[str, Any]] = []
+        # 上次获取最佳表达式时的分数（分数未提高时无需重新获取表达式）
+        self._last_best_score = float('-inf')
+        # 有界队列：超出上限时 O(1) 丢弃最旧的记录（仅供界面展示最近的历史）
+        self.api_calls_log: Deque[Dict[str, Any]] = deque(maxlen=200)
+        # 滚动汇总：覆盖本次拟合的全部记录（不受日志长度上限影响），界面统计直接使用
+        self.api_call_counts: CounterType[str] = Counter()
+        self.api_status_counts: CounterType[str] = Counter()
+        self.api_score_stats: Dict[str, float] = self._empty_score_stats()
+        self.last_api_call: Optional[Dict[str, Any]] = None
         self.score_history: List[float] = []
         # 版本与进度帧（用于与前端同步每次 epoch 打印）
         self.state_version: int = 0
-        self.progress_frames: List[Dict[str, Any]] = []
+        # 进度帧以列存储（SoA）的环形缓冲区保存：数值字段放在预分配的 NumPy 数组中，
+        # 只有变长的表达式与日志保留为 Python 对象；帧字典仅在读取时按需生成。
+        # 帧的 version 从 1 起连续递增，第 v 帧位于下标 (v - 1) % _FRAME_CAPACITY
+        self._frame_cycle = np.zeros(_FRAME_CAPACITY, dtype=np.int32)
+        self._frame_epoch = np.zeros(_FRAME_CAPACITY, dtype=np.int32)
+        self._frame_total_epochs = np.zeros(_FRAME_CAPACITY, dtype=np.int32)
+        self._frame_score = np.zeros(_FRAME_CAPACITY, dtype=np.float64)
+        self._frame_ts = np.zeros(_FRAME_CAPACITY, dtype=np.float64)
+        self._frame_expr: List[str] = [""] * _FRAME_CAPACITY
+        self._frame_log: List[str] = [""] * _FRAME_CAPACITY
         self.final_best: Optional[Dict[str, Any]] = None
+        # diary 增量读取状态：已扫描到的字节偏移、未完整的尾行以及累计调用数
+        self._diary_path: Optional[str] = None
+        self._diary_mtime: Optional[float] = None
+        self._diary_offset = 0
+        self._diary_buffer: List[bytes] = []
+        self._diary_calls = 0
+        # evaluate_expression 使用的常量（只复制一次），以及用作编译缓存键的有序常量元组
+        self._eval_constants: Dict[str, Any] = dict(self.config.get('constant_map', {}))
+        self._eval_constants_key: Tuple[Tuple[str, Any], ...] = tuple(sorted(self._eval_constants.items()))
+        # 编译后备路径允许调用的函数（即配置的可用函数）
+        self._eval_functions: Tuple[str, ...] = tuple(self.config.get('functions', ()))
+        # evaluate_expression 的变量字典缓存：键为 (id(x), x.shape)，值中保留 x 的引用，
+        # 确保缓存期间 id 不会被新数组复用；绘图网格与数据点交替评估时可同时命中
+        self._eval_cache: Dict[Tuple[int, Tuple[int, ...]], Tuple[np.ndarray, Dict[str, Any]]] = {}
+        # 保护并行 epoch 时的共享状态（最佳结果、进度帧、API 日志）
+        self._state_lock = threading.Lock()
+        # 拟合过程中的日志经有界队列交给后台线程写出，拟合循环不因标准输出 IO 阻塞
+        self._log_q: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1024)
+        self._log_thread: Optional[threading.Thread] = None
         
         # 回调函数
         self.on_progress_update: Optional[Callable] = None
@@ -99,8 +313,7 @@ class FittingEngine:
         logs_dir.mkdir(exist_ok=True)
         
         # 使用时间戳创建唯一的子目录
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.result_path = str(logs_dir / f"fit_{timestamp}")
+        self.result_path = str(logs_dir / f"fit_{self._run_tag}")
         os.makedirs(self.result_path, exist_ok=True)
         
         print_flush(f"\n📁 日志目录: {self.result_path}")
@@ -192,8 +405,7 @@ class FittingEngine:
         logs_dir.mkdir(exist_ok=True)
         
         # 使用时间戳创建唯一的子目录
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.database_path = str(logs_dir / f"db_{timestamp}")
+        self.database_path = str(logs_dir / f"db_{self._run_tag}")
         os.makedirs(self.database_path, exist_ok=True)
         
         print_flush(f"📁 数据库目录: {self.database_path}\n")
@@ -211,7 +423,7 @@ class FittingEngine:
         if canvas_image is not None:
             print_flush(f"📷 画布图片已设置（长度: {len(canvas_image)} 字符）\n")
             # base64 decoded image string
-            canvas_image_decoded = base64.b64decode(canvas_image)
+            canvas_image_decoded = _decode_canvas(canvas_image)
             self.ideasearcher.set_images([canvas_image_decoded])
             original_epilogue_section = self.ideasearcher.get_epilogue_section()
             epilogue_section_with_image = "Here is the image showing the function curve you are going to fit: <image>\n" + original_epilogue_section
@@ -260,6 +472,8 @@ class FittingEngine:
             yerr: 误差数据数组（可选）
             canvas_image: base64 编码的画布图片（可选）
         """
+        executor: Optional[ThreadPoolExecutor] = None
+        self._start_log_writer()
         try:
             # 初始化
             self.is_running = True
@@ -267,188 +481,286 @@ class FittingEngine:
             self.current_cycle = 0
             self.total_cycles = self.config['cycle_num']
             self.start_time = time.time()
-            self.api_calls_log = []
+            self._run_tag = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.api_calls_log.clear()
+            self.api_call_counts.clear()
+            self.api_status_counts.clear()
+            self.api_score_stats = self._empty_score_stats()
+            self.last_api_call = None
             self.score_history = []
+            self._diary_path = None
+            self._last_best_score = float('-inf')
+            
+            # 可选的并行 epoch：每组同时提交 epoch_workers 个 run(1)（默认 1，即串行）
+            epoch_workers = max(1, int(self.config.get('epoch_workers', 1)))
+            if epoch_workers > 1:
+                executor = ThreadPoolExecutor(max_workers=epoch_workers)
             
             # 初始化 fitter 和 searcher
             self.initialize_fitter(x, y, yerr)
             self.initialize_searcher(canvas_image)
             
-            print(f"\n🚀 开始拟合 - 目标循环数: {self.total_cycles}\n")
-            sys.stdout.flush()
+            # 循环内不变的配置项与绑定方法提前取出为局部变量
+            shutdown_score = self.config['shutdown_score']
+            total_epochs = self.config['unit_interaction_num']
+            run_epochs = self.ideasearcher.run
+            get_best_fit = self.fitter.get_best_fit
+            get_best_score = self.ideasearcher.get_best_score
+            
+            self._log(f"\n🚀 开始拟合 - 目标循环数: {self.total_cycles}\n")
             
             # 运行循环
             for cycle in range(self.config['cycle_num']):
                 if self.should_stop:
-                    print_flush("\n⏹️  拟合已手动停止\n")
+                    self._log("\n⏹️  拟合已手动停止\n")
                     break
                 
                 self.current_cycle = cycle + 1
                 
                 # 动态设置 filter_func（参考演示代码）
                 # 每3个循环切换一次过滤策略
-                if cycle % 3 == 0:
-                    self.ideasearcher.set_filter_func(lambda idea: idea)  # 保留想法
-                else:
-                    self.ideasearcher.set_filter_func(lambda idea: "")  # 清空想法（强制生成新的）
+                self.ideasearcher.set_filter_func(_keep_idea if cycle % 3 == 0 else _clear_idea)
                 
                 # 重新填充岛屿（第一次循环除外）
                 if cycle != 0:
                     self.ideasearcher.repopulate_islands()
                 
-                print(f"⏳ 循环 {self.current_cycle}/{self.total_cycles} 进行中...")
-                sys.stdout.flush()
+                self._log(f"⏳ 循环 {self.current_cycle}/{self.total_cycles} 进行中...")
                 
                 # 分批运行 epoch 以实现实时更新
                 # 每批运行较少的epoch，运行后立即更新状态，这样界面可以实时刷新
                 epochs_per_batch = 1  # 每批运行1个epoch，确保频繁更新
-                total_epochs = self.config['unit_interaction_num']
                 
-                for batch in range(total_epochs):
+                finished = False
+                for start in range(0, total_epochs, epoch_workers):
                     if self.should_stop:
-                        print_flush("\n⏹️  拟合已手动停止\n")
+                        self._log("\n⏹️  拟合已手动停止\n")
                         break
                     
-                    try:
-                        # 运行一批epoch
-                        print_flush(f"  🔄 执行 Epoch {batch + 1}/{total_epochs}...")
-                        self.ideasearcher.run(epochs_per_batch)
-                        
-                        # 立即更新最佳结果
-                        log_message = ""
+                    # 并行模式下同一组的 epoch 同时提交（网络调用相互重叠），再按顺序记录结果
+                    batches = range(start, min(start + epoch_workers, total_epochs))
+                    runs = None
+                    if executor is not None and len(batches) > 1:
+                        runs = []
+                        for batch in batches:
+                            self._log(f"  🔄 执行 Epoch {batch + 1}/{total_epochs}...")
+                            runs.append(executor.submit(run_epochs, epochs_per_batch))
+                    
+                    for i, batch in enumerate(batches):
                         try:
-                            self.best_expression = self.fitter.get_best_fit()
-                            self.best_score = self.ideasearcher.get_best_score()
+                            if runs is None:
+                                # 运行一批epoch
+                                self._log(f"  🔄 执行 Epoch {batch + 1}/{total_epochs}...")
+                                run_epochs(epochs_per_batch)
+                            else:
+                                runs[i].result()
                             
-                            # 简洁的终端输出
-                            progress = (batch + 1) / total_epochs * 100
-                            log_message = f"  ✅ Epoch {batch + 1}/{total_epochs} ({progress:.0f}%) | 分数: {self.best_score:.4f} | 表达式: {self.best_expression[:50]}{'...' if len(self.best_expression) > 50 else ''}"
-                            print_flush(log_message)
-                        except Exception as e:
-                            log_message = f"  ⚠️ Epoch {batch + 1}/{total_epochs} | 获取结果出错: {e}"
-                            print_flush(log_message)
-                        
-                        # 更新 API 调用日志
-                        self._update_api_calls()
-                        
-                        # 记录进度帧并增加版本号（用于前端精准同步）
-                        try:
-                            frame = {
-                                'version': self.state_version + 1,
-                                'cycle': self.current_cycle,
-                                'epoch': batch + 1,
-                                'total_epochs': total_epochs,
-                                'score': float(self.best_score) if self.best_score is not None else None,
-                                'expression': self.best_expression,
-                                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                'log_message': log_message  # 记录日志消息
-                            }
-                            self.progress_frames.append(frame)
-                            # 限制内存占用：仅保留最近的 2000 帧
-                            if len(self.progress_frames) > 2000:
-                                self.progress_frames = self.progress_frames[-2000:]
-                            self.state_version += 1
-                        except Exception:
-                            pass
-
-                        # 触发进度更新回调（关键！实时更新界面）
-                        if self.on_progress_update:
-                            self.on_progress_update(self.get_state())
-                        
-                        # 检查是否达到目标分数
-                        if self.best_score >= self.config['shutdown_score']:
-                            print_flush(f"\n🎯 达到目标分数 {self.config['shutdown_score']}，提前结束\n")
-                            break
+                            # 获取最新结果与读取 diary 都在锁外进行，避免界面轮询 get_state 时等待
+                            log_message = ""
+                            best_expression = self.best_expression
+                            best_score = self.best_score
+                            try:
+                                # 分数没有提高时最佳表达式也不会变化，跳过 get_best_fit
+                                score = get_best_score()
+                                if score > self._last_best_score:
+                                    best_expression = get_best_fit()
+                                    self._last_best_score = score
+                                best_score = score
+                                
+                                # 简洁的终端输出
+                                progress = (batch + 1) / total_epochs * 100
+                                log_message = f"  ✅ Epoch {batch + 1}/{total_epochs} ({progress:.0f}%) | 分数: {best_score:.4f} | 表达式: {best_expression[:50]}{'...' if len(best_expression) > 50 else ''}"
+                                self._log(log_message)
+                            except Exception as e:
+                                log_message = f"  ⚠️ Epoch {batch + 1}/{total_epochs} | 获取结果出错: {e}"
+                                self._log(log_message)
+                            
+                            total_api_calls = self._count_api_calls()
+                            
+                            # 锁内只做共享状态的赋值与追加
+                            with self._state_lock:
+                                # 立即更新最佳结果
+                                self.best_expression = best_expression
+                                self.best_score = best_score
+                                self.total_api_calls = total_api_calls
+                                
+                                # 更新 API 调用日志
+                                self._record_api_call()
+                                
+                                # 记录进度帧并增加版本号（用于前端精准同步）
+                                try:
+                                    self._append_frame(batch + 1, total_epochs, log_message)
+                                except Exception:
+                                    pass
+                            
+                            # 触发进度更新回调（关键！实时更新界面）
+                            if self.on_progress_update:
+                                self.on_progress_update(self.get_state())
                             
-                    except KeyboardInterrupt:
-                        print_flush("\n⚠️ 用户中断，停止拟合\n")
-                        self.should_stop = True
+                            # 检查是否达到目标分数
+                            if self.best_score >= shutdown_score:
+                                self._log(f"\n🎯 达到目标分数 {shutdown_score}，提前结束\n")
+                                finished = True
+                                break
+                                
+                        except KeyboardInterrupt:
+                            self._log("\n⚠️ 用户中断，停止拟合\n")
+                            self.should_stop = True
+                            finished = True
+                            break
+                        except Exception as e:
+                            # 捕获异常但不中断，继续下一个epoch
+                            error_msg = f"  ❌ Epoch {batch + 1} 执行出错: {e}"
+                            self._log(error_msg)
+                            self._log("  ⏭️  跳过此epoch，继续执行...")
+                            # 继续下一个epoch
+                            continue
+                    
+                    # 提前结束时也要等本组仍在运行的 epoch 完成，再进入下一循环
+                    if runs is not None:
+                        wait(runs)
+                    
+                    if finished:
                         break
-                    except Exception as e:
-                        # 捕获异常但不中断，继续下一个epoch
-                        error_msg = f"  ❌ Epoch {batch + 1} 执行出错: {e}"
-                        print_flush(error_msg)
-                        print_flush("  ⏭️  跳过此epoch，继续执行...")
-                        # 继续下一个epoch
-                        continue
                 
                 # 记录当前循环的分数历史
                 if self.best_score > 0:
                     self.score_history.append(self.best_score)
                 
                 # 循环完成后的总结输出
-                print(f"✅ 循环 {self.current_cycle} 完成 | 最终分数: {self.best_score:.4f}\n")
-                sys.stdout.flush()
+                self._log(f"✅ 循环 {self.current_cycle} 完成 | 最终分数: {self.best_score:.4f}\n")
                 
                 # 如果已达到目标分数，退出循环
-                if self.best_score >= self.config['shutdown_score']:
+                if self.best_score >= shutdown_score:
                     break
             
-            print(f"\n✨ 拟合完成！最终分数: {self.best_score:.4f}\n")
-            sys.stdout.flush()
+            self._log(f"\n✨ 拟合完成！最终分数: {self.best_score:.4f}\n")
             
             # 触发完成回调
             if self.on_complete:
                 self.on_complete(self.get_state())
         
         except Exception as e:
-            print(f"\n❌ 拟合过程出错: {e}\n")
-            sys.stdout.flush()
+            self._log(f"\n❌ 拟合过程出错: {e}\n")
             import traceback
             traceback.print_exc()
             sys.stdout.flush()
         
         finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            # 写出队列中剩余的日志
+            self._stop_log_writer()
             self.is_running = False
             # 记录最终最优结果
             self.final_best = {
                 'score': float(self.best_score) if self.best_score is not None else None,
                 'expression': self.best_expression,
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'timestamp': time.time(),
                 'total_cycles': self.total_cycles,
                 'total_api_calls': self.total_api_calls,
             }
     
+    def _log(self, message: str) -> None:
+        """
+        输出一行拟合日志
+        
+        后台写线程运行时放入队列后立即返回（队列已满则丢弃该行），否则直接打印
+        
+        Args:
+            message: 日志内容
+        """
+        if self._log_thread is None:
+            print_flush(message)
+            return
+        try:
+            self._log_q.put_nowait(message)
+        except queue.Full:
+            pass
+    
+    def _start_log_writer(self) -> None:
+        """启动后台日志写线程"""
+        if self._log_thread is not None:
+            return
+        self._log_thread = threading.Thread(target=self._log_writer, name="fitting-log-writer", daemon=True)
+        self._log_thread.start()
+    
+    def _stop_log_writer(self) -> None:
+        """发送结束标记并等待后台线程写完队列中剩余的日志"""
+        if self._log_thread is None:
+            return
+        self._log_q.put(None)
+        self._log_thread.join()
+        self._log_thread = None
+    
+    def _log_writer(self) -> None:
+        """后台线程：批量取出队列中的日志行，每批只写入并刷新一次标准输出"""
+        while True:
+            lines = [self._log_q.get()]
+            while True:
+                try:
+                    lines.append(self._log_q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            text = "".join(f"{line}\n" for line in lines if line is not None)
+            if text:
+                try:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                except Exception:
+                    # 输出失败（如管道已关闭）时丢弃，线程需继续消费队列
+                    pass
+            # None 为结束标记
+            if None in lines:
+                return
+    
     def _update_api_calls(self) -> None:
         """更新 API 调用日志（增强版,提供更详细的调用信息）"""
+        self.total_api_calls = self._count_api_calls()
+        self._record_api_call()
+    
+    def _count_api_calls(self) -> int:
+        """
+        从 diary 文件统计累计 API 调用次数（只读取文件，不修改共享的拟合状态）
+        
+        Returns:
+            累计 API 调用次数
+        """
         try:
             # 从 diary 文件中读取实际的 API 调用记录
             diary_path = self.ideasearcher.get_diary_path()
             if diary_path and os.path.exists(diary_path):
-                with open(diary_path, 'r', encoding='utf-8') as f:
-                    diary_content = f.read()
-                    
-                    # 统计实际的 API 调用次数（查找 get_answer 调用）
-                    # 更精确的匹配模式
-                    api_call_patterns = [
-                        r'get_answer.*?调用成功',
-                        r'API调用成功',
-                        r'模型响应成功',
-                    ]
-                    
-                    total_calls = 0
-                    for pattern in api_call_patterns:
-                        calls = re.findall(pattern, diary_content, re.DOTALL | re.IGNORECASE)
-                        total_calls += len(calls)
-                    
-                    self.total_api_calls = total_calls
-                    
-                    # 提取最近的API调用详情
-                    recent_calls = re.findall(
-                        r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\].*?模型[：:]?\s*(\S+).*?(?:调用成功|响应成功)',
-                        diary_content,
-                        re.DOTALL | re.IGNORECASE
-                    )
-                    
-                    # 打印API调用统计
-                    if total_calls > 0 and total_calls % 10 == 0:  # 每10次调用打印一次
-                        print_flush(f"  📊 累计API调用: {total_calls} 次")
+                # diary 路径变化（新一轮拟合）时从头开始扫描
+                if diary_path != self._diary_path:
+                    self._diary_path = diary_path
+                    self._diary_mtime = None
+                    self._diary_offset = 0
+                    self._diary_buffer = []
+                    self._diary_calls = 0
+                
+                # 文件自上次检查后未被修改，说明本批次没有新的 API 活动
+                mtime = os.path.getmtime(diary_path)
+                if mtime != self._diary_mtime:
+                    self._diary_mtime = mtime
+                    self._scan_diary(diary_path)
+                
+                total_calls = self._diary_calls
+                
+                # 打印API调用统计
+                if total_calls > 0 and total_calls % 10 == 0:  # 每10次调用打印一次
+                    self._log(f"  📊 累计API调用: {total_calls} 次")
+                return total_calls
                     
         except Exception as e:
             # 如果读取失败，使用估算值
-            print_flush(f"  ⚠️ 读取API日志失败: {e}, 使用估算值")
-            self.total_api_calls += self.config['unit_interaction_num'] * self.config['island_num']
+            self._log(f"  ⚠️ 读取API日志失败: {e}, 使用估算值")
+            return self.total_api_calls + self.config['unit_interaction_num'] * self.config['island_num']
         
+        return self.total_api_calls
+    
+    def _record_api_call(self) -> None:
+        """按当前最佳结果追加一条 API 调用记录"""
         # 无论是否有 best_expression，都记录当前循环的状态
         # 这样即使没有找到有效表达式，也会有调用记录显示
         expression_display = self.best_expression if hasattr(self, 'best_expression') and self.best_expression else "尚未生成有效表达式"
@@ -459,15 +771,55 @@ class FittingEngine:
             'model': self.config['models'][0] if self.config['models'] else 'Unknown',
             'expression': expression_display,
             'score': score_display,
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': time.time(),
             'total_api_calls': self.total_api_calls,
             'status': 'success' if (hasattr(self, 'best_expression') and self.best_expression) else 'no_expression'
         }
+        # 限制日志大小：deque 自动丢弃超出 200 条的旧记录
         self.api_calls_log.append(call_record)
+        self.api_call_counts[call_record['model']] += 1
+        self.api_status_counts[call_record['status']] += 1
+        score = float(call_record['score'])
+        stats = self.api_score_stats
+        stats['count'] += 1
+        stats['sum'] += score
+        stats['min'] = min(stats['min'], score)
+        stats['max'] = max(stats['max'], score)
+        if score > 0:
+            stats['valid'] += 1
+        self.last_api_call = call_record
+    
+    @staticmethod
+    def _empty_score_stats() -> Dict[str, float]:
+        """API 调用记录分数的累计统计初始值"""
+        return {'count': 0, 'sum': 0.0, 'min': float('inf'), 'max': float('-inf'), 'valid': 0}
+    
+    def _scan_diary(self, diary_path: str) -> None:
+        """
+        扫描 diary 文件中新追加的完整行，累加 API 调用次数
         
-        # 限制日志大小
-        if len(self.api_calls_log) > 1000:
-            self.api_calls_log = self.api_calls_log[-1000:]
+        Args:
+            diary_path: diary 文件路径
+        """
+        # 只读取上次之后新追加的字节
+        with open(diary_path, 'rb') as f:
+            f.seek(self._diary_offset)
+            chunk = f.read()
+            self._diary_offset = f.tell()
+        
+        # 仅扫描到最后一个换行符为止，未写完的尾行留到下次拼接
+        cut = chunk.rfind(b'\n') + 1
+        if not cut:
+            if chunk:
+                self._diary_buffer.append(chunk)
+            return
+        
+        self._diary_buffer.append(chunk[:cut])
+        delta = b''.join(self._diary_buffer).decode('utf-8', errors='replace')
+        self._diary_buffer = [chunk[cut:]] if cut < len(chunk) else []
+        
+        # 统计实际的 API 调用次数（每行至多计一次），逐个迭代匹配而不构建行或匹配列表
+        self._diary_calls += sum(1 for _ in _API_CALL_RE.finditer(delta))
     
     def stop_fitting(self) -> None:
         """停止拟合"""
@@ -482,19 +834,25 @@ class FittingEngine:
         """
         elapsed_time = time.time() - self.start_time if self.start_time > 0 else 0
         
-        return {
-            'is_running': self.is_running,
-            'current_cycle': self.current_cycle,
-            'total_cycles': self.total_cycles,
-            'best_score': self.best_score,
-            'best_expression': self.best_expression,
-            'total_api_calls': self.total_api_calls,
-            'elapsed_time': elapsed_time,
-            'api_calls_log': self.api_calls_log,
-            'score_history': self.score_history,
-            'state_version': self.state_version,
-            'last_frame': self.progress_frames[-1] if self.progress_frames else None,
-        }
+        with self._state_lock:
+            return {
+                'is_running': self.is_running,
+                'current_cycle': self.current_cycle,
+                'total_cycles': self.total_cycles,
+                'best_score': self.best_score,
+                'best_expression': self.best_expression,
+                'total_api_calls': self.total_api_calls,
+                'elapsed_time': elapsed_time,
+                # 界面会对日志切片，因此返回列表快照
+                'api_calls_log': list(self.api_calls_log),
+                'api_call_counts': dict(self.api_call_counts),
+                'api_status_counts': dict(self.api_status_counts),
+                'api_score_stats': dict(self.api_score_stats),
+                'last_api_call': self.last_api_call,
+                'score_history': self.score_history,
+                'state_version': self.state_version,
+                'last_frame': self._frame_at(self.state_version) if self.state_version > 0 else None,
+            }
     
     def get_pareto_frontier(self) -> Dict[int, Dict]:
         """
@@ -527,15 +885,64 @@ class FittingEngine:
         Returns:
             进度帧列表
         """
-        if since_version is None:
-            return list(self.progress_frames)
-        return [f for f in self.progress_frames if f.get('version', 0) > since_version]
-
+        # 与 get_state 一样在锁内读取，避免拟合线程覆盖最旧的槽位时读到不完整的帧
+        with self._state_lock:
+            # 帧的 version 连续递增，缓冲区中最早的帧版本可由最新版本直接算出
+            oldest = max(1, self.state_version - _FRAME_CAPACITY + 1)
+            start = oldest if since_version is None else max(oldest, since_version + 1)
+            return [self._frame_at(version) for version in range(start, self.state_version + 1)]
+    
+    def _append_frame(self, epoch: int, total_epochs: int, log_message: str) -> None:
+        """
+        将当前最佳结果写入进度帧环形缓冲区，并增加版本号
+        
+        Args:
+            epoch: 当前 epoch 序号（从 1 开始）
+            total_epochs: 本循环的 epoch 总数
+            log_message: 本 epoch 的日志消息
+        """
+        i = self.state_version % _FRAME_CAPACITY
+        self._frame_cycle[i] = self.current_cycle
+        self._frame_epoch[i] = epoch
+        self._frame_total_epochs[i] = total_epochs
+        # 分数缺失时以 NaN 存储
+        self._frame_score[i] = self.best_score if self.best_score is not None else np.nan
+        self._frame_ts[i] = time.time()
+        self._frame_expr[i] = self.best_expression
+        self._frame_log[i] = log_message
+        self.state_version += 1
+    
+    def _frame_at(self, version: int) -> Dict[str, Any]:
+        """
+        按版本号生成进度帧字典（时间戳在此时才格式化）
+        
+        Args:
+            version: 帧版本号（须仍在缓冲区内）
+        
+        Returns:
+            进度帧字典
+        """
+        i = (version - 1) % _FRAME_CAPACITY
+        score = float(self._frame_score[i])
+        return {
+            'version': version,
+            'cycle': int(self._frame_cycle[i]),
+            'epoch': int(self._frame_epoch[i]),
+            'total_epochs': int(self._frame_total_epochs[i]),
+            'score': None if np.isnan(score) else score,
+            'expression': self._frame_expr[i],
+            'timestamp': _format_ts(float(self._frame_ts[i])),
+            'log_message': self._frame_log[i],
+        }
+    
     def get_final_best(self) -> Optional[Dict[str, Any]]:
         """
         拟合结束后的最终最优结果
         """
-        return self.final_best
+        if self.final_best is None:
+            return None
+        # 内部以浮点时间戳记录，交给前端时才格式化
+        return {**self.final_best, 'timestamp': _format_ts(self.final_best['timestamp'])}
     
     def evaluate_expression(self, expression: str, x: np.ndarray) -> np.ndarray:
         """
@@ -549,29 +956,57 @@ class FittingEngine:
             y 值数组
         """
         try:
-            import numexpr
-            
-            # 准备变量字典
-            if x.ndim == 1:
-                x = x.reshape(-1, 1)
+            numexpr = _get_numexpr()
             
-            local_dict = {}
-            # 添加所有变量
-            for i in range(x.shape[1]):
-                local_dict[f'x{i+1}'] = x[:, i]
-            
-            # 添加常量
-            for const_name, const_value in self.config['constant_map'].items():
-                local_dict[const_name] = const_value
+            # 同一个 x 数组重复评估时（如实时绘图）直接复用变量字典
+            key = (id(x), x.shape)
+            cached = self._eval_cache.get(key)
+            if cached is None:
+                x2d = x.reshape(-1, 1) if x.ndim == 1 else x
+                
+                # 从预先准备的常量出发（一次 C 层字典复制），再添加所有变量
+                local_dict = dict(self._eval_constants)
+                for i in range(x2d.shape[1]):
+                    local_dict[f'x{i+1}'] = np.ascontiguousarray(x2d[:, i])
+                
+                # 只保留少量数组，超出时丢弃最早加入的一项
+                if len(self._eval_cache) >= _EVAL_CACHE_SIZE:
+                    del self._eval_cache[next(iter(self._eval_cache))]
+                cached = self._eval_cache[key] = (x, local_dict)
             
             # 评估表达式
-            y = numexpr.evaluate(expression, local_dict=local_dict)
+            y = numexpr.evaluate(expression, local_dict=cached[1])
             return y
         
         except Exception as e:
+            # numexpr 不支持的函数（如 square）改用 sympy/numba 编译路径
+            try:
+                return self._evaluate_compiled(expression, x)
+            except Exception:
+                pass
             print(f"评估表达式出错: {e}")
             return np.zeros_like(x[:, 0] if x.ndim == 2 else x)
     
+    def _evaluate_compiled(self, expression: str, x: np.ndarray) -> np.ndarray:
+        """
+        通过编译后的表达式函数求值
+        
+        Args:
+            expression: 数学表达式
+            x: x 值数组
+        
+        Returns:
+            y 值数组
+        """
+        x2d = x.reshape(-1, 1) if x.ndim == 1 else x
+        columns = [np.ascontiguousarray(x2d[:, i], dtype=np.float64) for i in range(x2d.shape[1])]
+        func = _compile_expr(expression, len(columns), self._eval_constants_key, self._eval_functions)
+        y = np.asarray(func(*columns), dtype=np.float64)
+        # 常数表达式返回标量，广播到与输入等长
+        if y.shape != (x2d.shape[0],):
+            y = np.broadcast_to(y, (x2d.shape[0],)).copy()
+        return y
+    
     # 移除了 cleanup() 方法和 __del__() 方法
     # 日志文件将永久保存在 logs 目录中，不会自动清理
     # 用户可以手动删除旧的日志文件
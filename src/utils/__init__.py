@@ -6,6 +6,7 @@ from .i18n import (
     t,
     set_language,
     get_current_language,
+    sync_language,
     get_supported_languages,
     get_language_flag,
     get_i18n_manager
@@ -15,6 +16,7 @@ __all__ = [
     't',
     'set_language',
     'get_current_language',
+    'sync_language',
     'get_supported_languages',
     'get_language_flag',
     'get_i18n_manager',
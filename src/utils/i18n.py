@@ -5,51 +5,103 @@
 
 import streamlit as st
 import json
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any
+
+# 优先使用 orjson 解析翻译文件，未安装时回退到标准库 json（两者都直接接受 bytes）
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 
 class I18nManager:
     """国际化管理器"""
     
+    __slots__ = ('translations', 'current_language', 'supported_languages', 'default_language', '_session_lang')
+    
     def __init__(self):
-        self.translations: Dict[str, Dict[str, Any]] = {}
+        # 每种语言的翻译被展平为 {'app.title': '...'} 形式，查找只需一次字典访问；
+        # 各语言在首次使用时才加载
+        self.translations: Dict[str, Dict[str, str]] = {}
         self.current_language = "zh_CN"
         self.supported_languages = ["zh_CN", "en_US"]
         self.default_language = "zh_CN"
-        
-        # 加载翻译文件
-        self._load_translations()
+        # 当前会话语言的缓存：管理器是进程级单例，而 Streamlit 每次运行脚本都在各自的线程中，
+        # 因此按线程缓存，避免每次 t() 都访问 st.session_state
+        self._session_lang = threading.local()
     
-    def _load_translations(self):
-        """加载翻译文件"""
-        translations_dir = Path(__file__).parent.parent / "config" / "translations"
+    def _ensure_loaded(self, lang: str) -> Dict[str, str]:
+        """
+        确保指定语言的翻译文件已加载
         
-        for lang in self.supported_languages:
-            translation_file = translations_dir / f"{lang}.json"
-            try:
-                with open(translation_file, 'r', encoding='utf-8') as f:
-                    self.translations[lang] = json.load(f)
-            except FileNotFoundError:
-                print(f"警告：未找到语言文件 {translation_file}")
-                self.translations[lang] = {}
+        Args:
+            lang: 语言代码
+        
+        Returns:
+            该语言展平后的翻译字典（不支持的语言返回空字典）
+        """
+        translation = self.translations.get(lang)
+        if translation is not None:
+            return translation
+        if lang not in self.supported_languages:
+            return {}
+        
+        translation_file = Path(__file__).parent.parent / "config" / "translations" / f"{lang}.json"
+        try:
+            translation = self._flatten(_json_loads(translation_file.read_bytes()))
+        except FileNotFoundError:
+            print(f"警告：未找到语言文件 {translation_file}")
+            translation = {}
+        self.translations[lang] = translation
+        return translation
+    
+    @staticmethod
+    def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, str]:
+        """将嵌套的翻译字典展平为以点号连接键的字典（只保留字符串值）"""
+        flat: Dict[str, str] = {}
+        for k, v in data.items():
+            if isinstance(v, dict):
+                flat.update(I18nManager._flatten(v, f"{prefix}{k}."))
+            elif isinstance(v, str):
+                flat[prefix + k] = v
+        return flat
     
     def set_language(self, language: str):
         """设置当前语言"""
         if language in self.supported_languages:
+            # 语言真正切换时才清空翻译缓存（app 每次重新运行都会调用本方法）
+            if language != self.current_language:
+                I18nManager._t_plain.cache_clear()
             self.current_language = language
+            self._session_lang.value = language
             # 保存到 session state
             st.session_state.language = language
         else:
             print(f"警告：不支持的语言 {language}")
     
-    def get_current_language(self) -> str:
-        """获取当前语言"""
+    def sync_language(self) -> str:
+        """
+        从 session state 同步当前语言（每次页面重新运行时在顶部调用一次）
+        
+        Returns:
+            当前语言
+        """
         # 优先从 session state 获取
         if 'language' in st.session_state:
             self.current_language = st.session_state.language
+        self._session_lang.value = self.current_language
         return self.current_language
     
+    def get_current_language(self) -> str:
+        """获取当前语言（使用缓存，未同步过时才读取 session state）"""
+        lang = getattr(self._session_lang, 'value', None)
+        if lang is None:
+            lang = self.sync_language()
+        return lang
+    
     def get_supported_languages(self) -> Dict[str, str]:
         """获取支持的语言列表"""
         return {
@@ -68,18 +120,7 @@ class I18nManager:
         Returns:
             翻译后的文本
         """
-        current_lang = self.get_current_language()
-        
-        # 尝试获取当前语言的翻译
-        translation = self._get_nested_value(self.translations.get(current_lang, {}), key)
-        
-        # 如果当前语言没有翻译，尝试默认语言
-        if translation is None and current_lang != self.default_language:
-            translation = self._get_nested_value(self.translations.get(self.default_language, {}), key)
-        
-        # 如果仍然没有翻译，返回键本身
-        if translation is None:
-            translation = key
+        translation = self._t_plain(self.get_current_language(), key)
         
         # 应用格式化参数
         try:
@@ -90,18 +131,22 @@ class I18nManager:
         
         return translation
     
-    def _get_nested_value(self, data: Dict[str, Any], key: str) -> Optional[str]:
-        """获取嵌套字典值"""
-        keys = key.split('.')
-        current = data
+    @lru_cache(maxsize=4096)
+    def _t_plain(self, lang: str, key: str) -> str:
+        """
+        查找未格式化的翻译文本（结果只取决于语言和键，因此可缓存）
         
-        for k in keys:
-            if isinstance(current, dict) and k in current:
-                current = current[k]
-            else:
-                return None
+        Args:
+            lang: 语言代码
+            key: 翻译键
         
-        return current if isinstance(current, str) else None
+        Returns:
+            翻译文本，找不到时回退到默认语言，仍然没有则返回键本身
+        """
+        translation = self._ensure_loaded(lang).get(key)
+        if translation is None:
+            translation = self._ensure_loaded(self.default_language).get(key, key)
+        return translation
     
     def get_language_flag(self, language: str) -> str:
         """获取语言标志图标"""
@@ -134,6 +179,10 @@ def get_current_language() -> str:
     """获取当前语言"""
     return get_i18n_manager().get_current_language()
 
+def sync_language() -> str:
+    """从 session state 同步当前语言"""
+    return get_i18n_manager().sync_language()
+
 def get_supported_languages() -> Dict[str, str]:
     """获取支持的语言列表"""
     return get_i18n_manager().get_supported_languages()
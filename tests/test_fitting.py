@@ -0,0 +1,41 @@
+"""
+拟合引擎表达式评估测试
+"""
+
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from src.core.fitting import FittingEngine
+
+
+def _make_engine() -> FittingEngine:
+    """使用默认配置中的可用函数与常量创建引擎"""
+    config_path = Path(__file__).parent.parent / "src" / "config" / "default.yaml"
+    with open(config_path, 'r', encoding='utf-8') as f:
+        fitter = yaml.safe_load(f)['fitter']
+    return FittingEngine({
+        'models': [],
+        'functions': fitter['available_functions'],
+        'constant_map': fitter['constant_map'],
+    })
+
+
+def test_evaluate_expression_numexpr():
+    """numexpr 支持的表达式直接求值"""
+    x = np.linspace(-2.0, 2.0, 50)
+    np.testing.assert_allclose(_make_engine().evaluate_expression('x1 * pi', x), x * np.pi)
+
+
+def test_evaluate_expression_square():
+    """numexpr 不支持的 square 走编译后备路径，而不是返回全零"""
+    x = np.linspace(-2.0, 2.0, 50)
+    np.testing.assert_allclose(_make_engine().evaluate_expression('square(x1)', x), x ** 2)
+
+
+def test_evaluate_expression_rejects_unsafe_syntax():
+    """白名单以外的语法不会交给 sympy，返回全零"""
+    x = np.linspace(-2.0, 2.0, 50)
+    y = _make_engine().evaluate_expression("square(x1).__class__", x)
+    np.testing.assert_array_equal(y, np.zeros_like(x))